@@ -1,15 +1,65 @@
 from utils.gpt import ask_gpt
+from utils.compaction import build_findings_prompt, compact_findings_prompt, DEFAULT_TOKEN_BUDGET
+from utils.severity import meets_severity
 from agents.script_parser import ScriptParser
 from agent import Agent
+import os
 import subprocess
+import sys
+import time
+from itertools import chain, islice
 
 class AnalyzeAgent(Agent):
-    def __init__(self):
+    def __init__(self, backend=None, cross_file=None):
         super().__init__(name="AnalyzeAgent", description="Analyzes scripts, logs, and configurations.")
+        self.backend = backend
+        # Optional CrossFileAnalyzer; shared across scripts so library summaries are reused.
+        self.cross_file = cross_file
 
-    def analyze_script(self, target, use_gpt=False):
+    def iter_findings(self, target, min_severity=None, max_findings=None):
+        """
+        Stream parser findings without collecting them; stops scanning once
+        max_findings have been yielded. Cross-file findings follow the
+        single-file ones when a cross-file analyzer is configured.
+        """
         parser = ScriptParser()
-        issues = parser.parse(target)
+        findings = parser.iter_findings(target, min_severity=min_severity)
+        if self.cross_file is not None:
+            findings = chain(findings, self.iter_cross_file_findings(target, min_severity))
+        return islice(findings, max_findings)
+
+    def iter_cross_file_findings(self, target, min_severity=None):
+        for issue in self.cross_file.analyze(target):
+            if meets_severity(issue, min_severity):
+                yield issue
+
+    def script_paths(self, target):
+        """
+        Yield target itself, or every *.sh file under it if it is a directory.
+        """
+        if not os.path.isdir(target):
+            yield target
+            return
+        for root, dirs, files in os.walk(target):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(".sh"):
+                    yield os.path.join(root, name)
+
+    def analyze_tree(self, target, **options):
+        sections = []
+        for path in self.script_paths(target):
+            sections.append(f"# {path}\n" + self.analyze_script(path, **options))
+        if not sections:
+            return f"No .sh scripts found under {target}."
+        return "\n\n".join(sections)
+
+    def analyze_script(self, target, use_gpt=False, token_budget=DEFAULT_TOKEN_BUDGET,
+                       min_severity=None, max_findings=None, compact=True):
+        try:
+            issues = list(self.iter_findings(target, min_severity=min_severity, max_findings=max_findings))
+        except (OSError, UnicodeDecodeError) as error:
+            return f"Error reading file: {str(error)}"
 
         if not issues:
             return "No critical issues detected by parser."
@@ -23,21 +73,33 @@ class AnalyzeAgent(Agent):
 
         # ---- OPTIONAL: GPT Explanation ----
         if use_gpt:
-            combined_prompt = (
+            prompt_header = (
                 "You are a security auditing assistant. Explain why each of these Bash lines might be risky.\n"
+                "Lines that share a pattern are listed once with their other line numbers.\n"
                 "Format your response as:\n"
                 "Line <line_number>: <explanation>\n\n"
             )
 
-            for issue in issues:
-                combined_prompt += (
-                    f"Line {issue['line_number']}:\n"
-                    f"{issue['code']}\n"
-                    f"Context: {issue['description']}\n\n"
+            if compact:
+                combined_prompt, stats = compact_findings_prompt(prompt_header, issues, token_budget=token_budget)
+                self.last_compaction = stats
+
+                saved_pct = (stats["saved_tokens"] * 100 // stats["original_tokens"]) if stats["original_tokens"] else 0
+                print(
+                    f"[INFO] Prompt compacted in {stats['compaction_ms']:.1f} ms: "
+                    f"{stats['findings']} findings -> {stats['included']} entries "
+                    f"(~{stats['original_tokens']} -> ~{stats['compacted_tokens']} tokens, {saved_pct}% saved"
+                    + (f", {stats['omitted']} summarized" if stats["omitted"] else "")
+                    + ")"
                 )
+            else:
+                combined_prompt = build_findings_prompt(prompt_header, issues)
 
             print("[INFO] Sending batched GPT request for all lines...")
-            explanation_response = ask_gpt(combined_prompt)
+            start = time.perf_counter()
+            explanation_response = ask_gpt(combined_prompt, backend=self.backend)
+            self.last_gpt_seconds = time.perf_counter() - start
+            print(f"[INFO] GPT request took {self.last_gpt_seconds:.2f}s")
 
             if explanation_response:
                 report += "\n\n## AI Explanations\n" + explanation_response
@@ -58,7 +120,7 @@ class AnalyzeAgent(Agent):
             "Be objective, list each major action or behavior clearly, without suggesting corrections or improvements.\n\n"
             f"{content}"
         )
-        behavior_summary = ask_gpt(prompt)
+        behavior_summary = ask_gpt(prompt, backend=self.backend)
         if not behavior_summary:
             print("[ERROR] GPT returned no summary.", file=sys.stderr)
             return "(No behavior summary returned.)"
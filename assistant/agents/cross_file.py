@@ -0,0 +1,412 @@
+#assistant/agents/cross_file.py
+
+import hashlib
+import os
+import re
+
+EXTERNAL_COMMANDS = ["grep", "cat", "awk", "sed", "cut", "tail", "head"]
+
+SOURCE_RE = re.compile(r'^\s*(?:source|\.)\s+(.+?)\s*(?:;.*|\|\|.*|&&.*)?$')
+ASSIGN_RE = re.compile(r'^\s*(?:export\s+|local\s+|readonly\s+|declare\s+(?:-\w+\s+)*)?([A-Za-z_]\w*)=(.*)$')
+READ_RE = re.compile(r'\bread\s+(?:-\w+\s+)*([A-Za-z_]\w*)')
+VAR_REF_RE = re.compile(r'\$\{?([A-Za-z_]\w*)')
+FUNC_DEF_RE = re.compile(r'^\s*(?:function\s+)?([A-Za-z_][\w-]*)\s*\(\)\s*\{?')
+# A command whose output is captured, e.g. x=$(get_cache key) or x=`get_cache key`
+CAPTURED_CALL_RE = re.compile(r'(?:\$\(|`)\s*([A-Za-z_][\w-]*)')
+SCRIPT_DIR_PREFIXES = [
+    r'\$\(\s*dirname\s+"?\$0"?\s*\)',
+    r'\$\(\s*dirname\s+"?\$\{BASH_SOURCE(?:\[0\])?\}"?\s*\)',
+    r'\$\{BASH_SOURCE(?:\[0\])?%/\*\}',
+]
+
+
+class CrossFileAnalyzer:
+    """
+    Follows `source`/`.` includes and reports taint and cache flows that cross
+    file boundaries. Each file is summarized once per distinct content hash, and
+    the combined view of a file plus everything it includes is memoized too, so
+    a tree of scripts sharing a few libraries costs about one pass per file.
+    A memoized view records the content hash of every file it was built from
+    and is rebuilt if any of them has changed since.
+
+    Taint only flows from an included file back to its includer: each file's
+    environment is built standalone, without the includer's variables at the
+    `source` line, so a library doing `Y=$X` with X tainted by its includer (or
+    by another member of an include cycle) does not mark Y as tainted.
+    """
+
+    def __init__(self, include_paths=None):
+        self.include_paths = include_paths or []
+        self.summaries = {}     # content hash -> per-file summary
+        self.file_hashes = {}   # path -> (mtime, size, content hash)
+        self.environments = {}  # path -> combined include environment (validated via its "deps")
+
+    # ---- Per-file summaries ----
+
+    def content_hash(self, path):
+        stat = os.stat(path)
+        cached = self.file_hashes.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2], None
+
+        with open(path, 'r', encoding='utf-8') as file:
+            content = file.read()
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self.file_hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest, content
+
+    def summarize(self, path):
+        """
+        Return the summary for path, computing it only if its content is new.
+        """
+        digest, content = self.content_hash(path)
+        summary = self.summaries.get(digest)
+        if summary is None:
+            if content is None:
+                with open(path, 'r', encoding='utf-8') as file:
+                    content = file.read()
+            summary = self.build_summary(content.splitlines())
+            self.summaries[digest] = summary
+        return digest, summary
+
+    def build_summary(self, lines):
+        """
+        Summarize one file: includes, assignments (with the variables they read
+        from and whether they take external input), eval sites, cache functions
+        it defines and captured calls to cache functions. Nothing here depends
+        on other files.
+        """
+        summary = {
+            "includes": [],
+            "assignments": [],
+            "evals": [],
+            "cache_functions": [],
+            "cache_calls": [],
+        }
+
+        for idx, line in enumerate(lines):
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+
+            source_match = SOURCE_RE.match(line)
+            if source_match:
+                summary["includes"].append((idx + 1, source_match.group(1).strip('"\''), stripped))
+
+            assign_match = ASSIGN_RE.match(line)
+            if assign_match:
+                var_name, value = assign_match.groups()
+                summary["assignments"].append({
+                    "var": var_name,
+                    "line_number": idx + 1,
+                    "refs": set(VAR_REF_RE.findall(value)),
+                    "external": any(cmd in value for cmd in EXTERNAL_COMMANDS),
+                })
+
+            for read_var in READ_RE.findall(line):
+                summary["assignments"].append({
+                    "var": read_var,
+                    "line_number": idx + 1,
+                    "refs": set(),
+                    "external": True,
+                })
+
+            if "eval" in line:
+                summary["evals"].append({
+                    "line_number": idx + 1,
+                    "code": stripped,
+                    "refs": set(VAR_REF_RE.findall(line)),
+                })
+
+            func_match = FUNC_DEF_RE.match(line)
+            if func_match and "cache" in func_match.group(1):
+                summary["cache_functions"].append((idx + 1, func_match.group(1)))
+
+            for called in CAPTURED_CALL_RE.findall(line):
+                if "cache" in called:
+                    summary["cache_calls"].append((idx + 1, called, stripped))
+
+        return summary
+
+    # ---- Include graph ----
+
+    def resolve_include(self, raw_path, including_file):
+        """
+        Return (resolved path or None, candidate paths checked and found missing).
+        An unresolved include with no candidates depends on runtime state.
+        """
+        base_dir = os.path.dirname(os.path.abspath(including_file))
+        path = raw_path
+        for prefix in SCRIPT_DIR_PREFIXES:
+            path = re.sub(prefix, base_dir.replace('\\', '\\\\'), path)
+        path = path.replace('"', '').replace("'", '')
+        if "$" in path:
+            return None, []  # depends on runtime state we can't resolve statically
+
+        candidates = [path] if os.path.isabs(path) else [os.path.join(base_dir, path)]
+        if not os.path.isabs(path):
+            candidates += [os.path.join(include_dir, path) for include_dir in self.include_paths]
+        candidates = [os.path.normpath(candidate) for candidate in candidates]
+        for position, candidate in enumerate(candidates):
+            if os.path.isfile(candidate):
+                return candidate, candidates[:position]
+        return None, candidates
+
+    def include_edges(self, path):
+        """
+        Resolved includes of path as {line number: included path}, a list of
+        (line number, code, reason) for includes that could not be followed, and
+        the paths that were missing or unreadable (so a later fix is noticed).
+        An unreadable include is skipped rather than failing the including file.
+        Not memoized: whether an include resolves or reads can change between calls.
+        """
+        _, summary = self.summarize(path)
+
+        included_at = {}
+        problems = []
+        absent = {}
+        for line_number, raw_path, code in summary["includes"]:
+            include, missing = self.resolve_include(raw_path, path)
+            # Any of these appearing later would change how the include resolves.
+            absent.update((candidate, "missing") for candidate in missing)
+            if include is None:
+                reason = "was not found" if missing else "could not be resolved statically"
+                problems.append((line_number, code, reason))
+                continue
+            try:
+                self.summarize(include)
+            except (OSError, UnicodeDecodeError) as error:
+                problems.append((line_number, code, f"could not be read ({error})"))
+                absent[include] = f"unreadable: {type(error).__name__}"
+                continue
+            included_at[line_number] = include
+
+        return included_at, problems, absent
+
+    def file_state(self, path):
+        """
+        Content hash of path, or a marker saying why it has none, so that a
+        file appearing, disappearing or becoming readable is noticed.
+        """
+        if not os.path.isfile(path):
+            return "missing"
+        try:
+            return self.summarize(path)[0]
+        except (OSError, UnicodeDecodeError) as error:
+            return f"unreadable: {type(error).__name__}"
+
+    def cached_environment(self, path):
+        """
+        Return the memoized environment for path if none of the files it was
+        built from changed since; otherwise drop it and return None.
+        """
+        env = self.environments.get(path)
+        if env is None:
+            return None
+        for dep_path, dep_state in env["deps"]:
+            if self.file_state(dep_path) != dep_state:
+                del self.environments[path]
+                return None
+        return env
+
+    def build_environment(self, path, lookup):
+        """
+        Single pass over path in line order. Included files' environments come
+        from lookup(include) and are applied at the line they are sourced.
+        Records, for each eval site, the referenced variables whose taint
+        originates in another file.
+        """
+        digest, summary = self.summarize(path)
+        included_at, problems, absent = self.include_edges(path)
+
+        events = [(eval_site["line_number"], 0, eval_site) for eval_site in summary["evals"]]
+        events += [(line_number, 1, include) for line_number, include in included_at.items()]
+        events += [(assignment["line_number"], 2, assignment) for assignment in summary["assignments"]]
+
+        tainted = {}
+        cache_functions = {}
+        eval_hits = []
+        # (path, content hash or missing/unreadable marker) for everything this view used.
+        deps = {(path, digest)} | set(absent.items())
+        # Evals see state from before their own line; includes apply before same-line assignments.
+        for _, kind, payload in sorted(events, key=lambda event: (event[0], event[1])):
+            if kind == 0:
+                for var in sorted(payload["refs"]):
+                    if var in tainted and tainted[var][0] != path:
+                        eval_hits.append((payload, var, tainted[var]))
+            elif kind == 1:
+                included_env = lookup(payload)
+                tainted.update(included_env["tainted"])
+                cache_functions.update(included_env["cache_functions"])
+                deps |= included_env["deps"]
+            else:
+                source = next((ref for ref in payload["refs"] if ref in tainted), None)
+                if payload["external"]:
+                    tainted[payload["var"]] = (path, payload["line_number"])
+                elif source is not None:
+                    tainted[payload["var"]] = tainted[source]
+                else:
+                    tainted.pop(payload["var"], None)
+
+        for line_number, name in summary["cache_functions"]:
+            cache_functions[name] = (path, line_number)
+
+        return {
+            "tainted": tainted,
+            "cache_functions": cache_functions,
+            "eval_hits": eval_hits,
+            "problems": problems,
+            "deps": frozenset(deps),
+        }
+
+    def environment(self, path):
+        """
+        Combined view of path and everything it includes (transitively):
+        tainted variables with their origin and the cache functions in scope.
+        """
+        path = os.path.normpath(os.path.abspath(path))
+        env = self.cached_environment(path)
+        if env is None:
+            self.resolve_components(path)
+            env = self.environments[path]
+        return env
+
+    def resolve_components(self, root):
+        """
+        Compute environments for root and every file it reaches that has no
+        current memoized environment.
+        Uses an iterative Tarjan walk so strongly connected components (include
+        cycles) come out dependencies-first; each component is evaluated once
+        and every member's environment is memoized.
+        """
+        def successors(node):
+            included_at, _, _ = self.include_edges(node)
+            return [include for include in included_at.values()
+                    if self.cached_environment(include) is None]
+
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        work = []
+
+        def visit(node):
+            index[node] = low[node] = len(index)
+            stack.append(node)
+            on_stack.add(node)
+            work.append((node, iter(successors(node))))
+
+        visit(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    visit(child)
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    self.evaluate_component(component)
+
+    def evaluate_component(self, component):
+        """
+        Memoize environments for one strongly connected component. A single
+        file that does not include itself needs one pass. For a cycle, members
+        are re-evaluated against each other's latest environments until nothing
+        changes (bounded by the component size, since taint travels at most
+        once around the cycle).
+        """
+        members = set(component)
+        node = component[0]
+        if len(component) == 1 and node not in self.include_edges(node)[0].values():
+            self.environments[node] = self.build_environment(
+                node, lambda include: self.environments[include])
+            return
+
+        empty = {"tainted": {}, "cache_functions": {}, "deps": frozenset()}
+        current = {member: empty for member in component}
+
+        def lookup(include):
+            if include in members:
+                return current[include]
+            return self.environments[include]
+
+        for _ in range(len(component) + 1):
+            changed = False
+            for member in component:
+                env = self.build_environment(member, lookup)
+                previous = current[member]
+                if env["tainted"] != previous["tainted"] or env["cache_functions"] != previous["cache_functions"]:
+                    changed = True
+                current[member] = env
+            if not changed:
+                break
+
+        # Every member depends on the whole cycle.
+        deps = frozenset().union(*(current[member]["deps"] for member in component))
+        for member in component:
+            self.environments[member] = dict(current[member], deps=deps)
+
+    # ---- Findings ----
+
+    def analyze(self, path):
+        """
+        Return cross-file findings for path, in the same shape as ScriptParser issues.
+        Flows that stay inside path are left to the single-file detectors.
+        """
+        path = os.path.normpath(os.path.abspath(path))
+        _, summary = self.summarize(path)
+        if not summary["includes"]:
+            return []
+        env = self.environment(path)
+        issues = []
+        issues.extend(self.detect_include_problems(env))
+        issues.extend(self.detect_cross_file_eval(env))
+        issues.extend(self.detect_cross_file_cache(path, summary, env))
+        return issues
+
+    def detect_include_problems(self, env):
+        for line_number, code, reason in env["problems"]:
+            yield {
+                "severity": "Info",
+                "type": "unresolved_include",
+                "line_number": line_number,
+                "code": code,
+                "description": f"Sourced file {reason} — cross-file analysis skipped it."
+            }
+
+    def detect_cross_file_eval(self, env):
+        for eval_site, var, (origin_file, origin_line) in env["eval_hits"]:
+            yield {
+                "severity": "Critical",
+                "type": "external_input_to_eval",
+                "line_number": eval_site["line_number"],
+                "code": eval_site["code"],
+                "description": f"External input from variable '{var}' (assigned in {os.path.basename(origin_file)} line {origin_line}) used inside eval — cross-file command injection risk."
+            }
+
+    def detect_cross_file_cache(self, path, summary, env):
+        for line_number, name, code in summary["cache_calls"]:
+            origin = env["cache_functions"].get(name)
+            if origin is None or origin[0] == path:
+                continue
+            origin_file, origin_line = origin
+            yield {
+                "severity": "High",
+                "type": "abuse_of_cache",
+                "line_number": line_number,
+                "code": code,
+                "description": f"Cached data retrieved via '{name}' (defined in {os.path.basename(origin_file)} line {origin_line}) — cross-file logic obfuscation or delayed execution vector."
+            }
@@ -2,8 +2,9 @@ from agent import Agent
 from utils.gpt import ask_gpt
 
 class FixAgent(Agent):
-    def __init__(self):
+    def __init__(self, backend=None):
         super().__init__(name="FixAgent", description="Proposes safe fixes for scripts.")
+        self.backend = backend
 
     def propose_fix(self, target):
         try:
@@ -21,10 +22,10 @@ class FixAgent(Agent):
             f"{content}"
         )
 
-        response = ask_gpt(prompt)
+        response = ask_gpt(prompt, backend=self.backend)
         if response.startswith("```bash"):
             response = response.removeprefix("```bash").strip()
         if response.endswith("```"):
-             response = response.removesuffix("```").stri   
+             response = response.removesuffix("```").strip()
         return response if response else "No response from AI during fix suggestion."
  
\ No newline at end of file
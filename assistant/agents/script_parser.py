@@ -2,48 +2,75 @@
 
 import re
 
+from utils.severity import meets_severity
+
 class ScriptParser:
+    # (detector, most severe level it can emit). Detectors without an explicit
+    # severity on their findings are ranked as "Info".
+    DETECTORS = [
+        ("detect_unsanitized_read", "Critical"),
+        ("detect_dangerous_commands", "Critical"),
+        ("detect_toctou_patterns", "Warning"),
+        ("detect_unsafe_variable_expansion", "Info"),
+        ("detect_path_traversal", "Info"),
+        ("detect_tmpfile_race", "Info"),
+        ("detect_unsafe_path_manipulation", "Critical"),
+        ("detect_eval_from_external_input", "Critical"),
+        ("detect_sensitive_logging", "High"),
+        ("detect_pid_file_race", "Warning"),
+        ("detect_infinite_logging_loop", "Warning"),
+        ("detect_world_writable_files", "Warning"),
+        ("detect_delayed_self_destruct", "Critical"),
+        ("detect_background_lock_monitoring", "Medium"),
+        ("detect_caching_abuse_patterns", "High"),
+        ("detect_silent_failures", "Medium"),
+        ("detect_pid_masking_logic", "Warning"),
+    ]
+
     def __init__(self):
         self.issues = []
 
-    def parse(self, filepath):
+    def parse(self, filepath, min_severity=None):
+        self.issues = []
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-        except Exception as error:
+            self.issues = list(self.iter_findings(filepath, min_severity=min_severity))
+        except (OSError, UnicodeDecodeError) as error:
             return f"Error reading file: {str(error)}"
 
-        self.detect_unsanitized_read(lines)
-        self.detect_dangerous_commands(lines)
-        self.detect_toctou_patterns(lines)
-        self.detect_unsafe_variable_expansion(lines)
-        self.detect_path_traversal(lines)
-        self.detect_tmpfile_race(lines)
-        self.detect_unsafe_path_manipulation(lines) 
-        self.detect_eval_from_external_input(lines)
-        self.detect_sensitive_logging(lines)
-        self.detect_pid_file_race(lines)
-        self.detect_infinite_logging_loop(lines)
-        self.detect_world_writable_files(lines)
-        self.detect_delayed_self_destruct(lines)
-        self.detect_background_lock_monitoring(lines)
-        self.detect_caching_abuse_patterns(lines)
-        self.detect_silent_failures(lines)
-        self.detect_pid_masking_logic(lines)
+        return self.issues
 
+    def iter_findings(self, filepath, min_severity=None):
+        """
+        Yield findings one at a time as each detector produces them.
+        Nothing is accumulated, so a consumer can stop early (e.g. on the first
+        Critical finding) and the remaining detectors never run. Detectors that
+        cannot emit anything at or above min_severity are skipped entirely.
+
+        Detectors run one after another and several look at neighbouring or
+        earlier lines, so the file is read into memory once up front; the early
+        exit saves detector passes, not the read.
+        Raises OSError/UnicodeDecodeError if the file cannot be read.
+        """
+        with open(filepath, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
 
-        return self.issues
+        for detector_name, max_severity in self.DETECTORS:
+            if not meets_severity({"severity": max_severity}, min_severity):
+                continue
+            for issue in getattr(self, detector_name)(lines):
+                if meets_severity(issue, min_severity):
+                    yield issue
 
     def detect_unsanitized_read(self, lines):
         for idx, line in enumerate(lines):
             if "read " in line and not ("-r" in line or "--raw" in line):
-                self.issues.append({
+                yield {
                     "severity": "Critical",
                     "type": "unsanitized_input",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "Unsanitized 'read' input detected (possible command injection)"
-                })
+                }
 
     def detect_dangerous_commands(self, lines):
         dangerous_keywords = [
@@ -52,13 +79,13 @@ class ScriptParser:
         for idx, line in enumerate(lines):
             for keyword in dangerous_keywords:
                 if keyword in line:
-                    self.issues.append({
+                    yield {
                         "severity": "Critical",
                         "type": "dangerous_command",
                         "line_number": idx + 1,
                         "code": line.strip(),
                         "description": f"Dangerous command usage detected: {keyword}"
-                    })
+                    }
 
     def detect_toctou_patterns(self, lines):
         """
@@ -72,13 +99,13 @@ class ScriptParser:
             if ">" in line or "cat" in line or "rm " in line or "mv " in line:
                 for check_idx, check in file_checks:
                     if idx > check_idx and idx - check_idx < 10:  # within vulnerable window
-                        self.issues.append({
+                        yield {
                             "severity": "Warning",
                             "type": "toctou_race",
                             "line_number": idx + 1,
                             "code": line.strip(),
                             "description": f"Potential TOCTOU race condition after check at line {check_idx + 1}"
-                        })
+                        }
 
     def detect_unsafe_variable_expansion(self, lines):
         """
@@ -86,13 +113,13 @@ class ScriptParser:
         """
         for idx, line in enumerate(lines):
             if "$" in line and '"' not in line and "'" not in line:
-                self.issues.append({
+                yield {
                     "severity": "Info",
                     "type": "unsafe_variable_expansion",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "Unquoted variable expansion detected (potential safety risk)"
-                })
+                }
                 
     def detect_path_traversal(self, lines):
         """
@@ -103,12 +130,12 @@ class ScriptParser:
         for idx, line in enumerate(lines):
             for extractor in risky_extractors:
                 if extractor in line and "$" in line:
-                    self.issues.append({
+                    yield {
                         "type": "path_traversal_risk",
                         "line_number": idx + 1,
                         "code": line.strip(),
                         "description": "Potential path traversal vulnerability (user input in extraction/copy operation)"
-                    })
+                    }
                     
     def detect_tmpfile_race(self, lines):
         """
@@ -117,12 +144,12 @@ class ScriptParser:
         """
         for idx, line in enumerate(lines):
             if "/tmp" in line and ("mktemp" not in line) and ("trap" not in line):
-                self.issues.append({
+                yield {
                     "type": "tmpfile_race_risk",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "Unsafe temp file usage without mktemp or file locking (possible race condition)"
-                })
+                }
                 
     def detect_unsafe_path_manipulation(self, lines):
         """
@@ -131,13 +158,13 @@ class ScriptParser:
         for idx, line in enumerate(lines):
             if "export PATH=" in line or "PATH=" in line:
                 if "." in line.split("=")[-1].split(":")[0]:
-                    self.issues.append({
+                    yield {
                         "severity": "Critical",
                         "type": "unsafe_path_manipulation",
                         "line_number": idx + 1,
                         "code": line.strip(),
                         "description": "Current directory (.) is prioritized in PATH — potential security risk (PATH poisoning)"
-                    })
+                    }
 
     def detect_eval_from_external_input(self, lines):
         """
@@ -160,22 +187,22 @@ class ScriptParser:
                 # See if eval is used with an externally sourced variable
                 for var in external_sources:
                     if var in line:
-                        self.issues.append({
+                        yield {
                             "severity": "Critical",
                             "type": "external_input_to_eval",
                             "line_number": idx + 1,
                             "code": line.strip(),
                             "description": f"External input from variable '{var}' (assigned at line {variable_assignments[var]}) used inside eval — command injection risk."
-                        })
+                        }
                 # If no match, still flag any dynamic eval even if variable unknown
                 if "$" in line:
-                    self.issues.append({
+                    yield {
                         "severity": "Warning",
                         "type": "eval_usage",
                         "line_number": idx + 1,
                         "code": line.strip(),
                         "description": "Use of eval detected with dynamic input — possible command injection risk."
-                    })
+                    }
 
     def detect_sensitive_logging(self, lines):
         """
@@ -183,13 +210,13 @@ class ScriptParser:
         """
         for idx, line in enumerate(lines):
             if re.search(r'echo.*SECRET|echo.*PASSWORD|echo.*TOKEN', line, re.IGNORECASE):
-                self.issues.append({
+                yield {
                     "severity": "High",
                     "type": "sensitive_info_leak",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "Sensitive information echoed or logged — potential information leak."
-                })
+                }
 
     def detect_pid_file_race(self, lines):
         """
@@ -200,13 +227,13 @@ class ScriptParser:
             if "pid_file=" in line or "/var/run/" in line:
                 pid_detected = True
             if pid_detected and ("kill" in line or "rm" in line) and "$old_pid" in line:
-                self.issues.append({
+                yield {
                     "severity": "Warning",
                     "type": "pid_file_race_risk",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "Possible PID reuse race condition — process ID may have changed before action."
-                })
+                }
 
     def detect_infinite_logging_loop(self, lines):
         """
@@ -217,13 +244,13 @@ class ScriptParser:
             if "while true" in line:
                 inside_loop = True
             if inside_loop and ("echo" in line or ">>" in line):
-                self.issues.append({
+                yield {
                     "severity": "Warning",
                     "type": "infinite_logging_risk",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "Infinite loop detected writing to file — potential denial of service."
-                })
+                }
 
     def detect_world_writable_files(self, lines):
         """
@@ -231,13 +258,13 @@ class ScriptParser:
         """
         for idx, line in enumerate(lines):
             if "chmod 666" in line or "chmod a+w" in line:
-                self.issues.append({
+                yield {
                     "severity": "Warning",
                     "type": "world_writable_file",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "World-writable file permissions detected — security risk."
-                })
+                }
 
     def detect_delayed_self_destruct(self, lines):
         """
@@ -256,13 +283,13 @@ class ScriptParser:
                 cache_line = idx + 1
 
             if re.search(r'(>|>>)\s*/dev/null', line) and "ping" in line:
-                self.issues.append({
+                yield {
                     "severity": "Low",
                     "type": "silent_failure",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "Silent network check (output fully suppressed) — may obscure critical failures."
-                })
+                }
 
             if re.search(r'if.*\|.*grep.*[><=!]', line) or "if" in line and "retrieve_cached_data" in line:
                 suspicious_trigger = True
@@ -272,13 +299,13 @@ class ScriptParser:
                 rm_line = idx + 1
 
         if cache_used and suspicious_trigger and rm_detected:
-            self.issues.append({
+            yield {
                 "severity": "Critical",
                 "type": "delayed_self_destruct",
                 "line_number": rm_line,
                 "code": lines[rm_line - 1].strip(),
                 "description": f"Delayed self-destruct logic detected: `rm -rf` triggered by cached or delayed condition (see cache near line {cache_line})"
-            })
+            }
 
 
     def detect_background_lock_monitoring(self, lines):
@@ -287,13 +314,13 @@ class ScriptParser:
         """
         for idx, line in enumerate(lines):
             if "is_system_locked" in line and "log_message" in lines[idx + 1] and "&" in lines[-1]:
-                self.issues.append({
+                yield {
                     "severity": "Medium",
                     "type": "background_lock_monitor",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "System lock state is being monitored in the background — could be part of hidden control logic."
-                })
+                }
 
     def detect_caching_abuse_patterns(self, lines):
         """
@@ -310,13 +337,13 @@ class ScriptParser:
 
         for idx in cache_reads:
             if any(abs(idx - widx) > 5 for widx in cache_writes):  
-                self.issues.append({
+                yield {
                     "severity": "High",
                     "type": "abuse_of_cache",
                     "line_number": idx + 1,
                     "code": lines[idx].strip(),
                     "description": "Cached data retrieved far from where it was stored — possible logic obfuscation or delayed execution vector."
-                })
+                }
 
     def detect_silent_failures(self, lines):
         """
@@ -325,13 +352,13 @@ class ScriptParser:
         suppressors = ["ping", "curl", "wget", "systemctl", "apt-get", "yum", "dnf"]
         for idx, line in enumerate(lines):
             if any(cmd in line for cmd in suppressors) and ">/dev/null" in line and "2>/dev/null" in line:
-                self.issues.append({
+                yield {
                     "severity": "Medium",
                     "type": "silent_failure",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": "Command output and error fully suppressed — failures may go undetected."
-                })
+                }
 
     def detect_pid_masking_logic(self, lines):
         """
@@ -356,13 +383,13 @@ class ScriptParser:
 
             if found_pid_check and ("exit" in line or "return" in line):
                 found_early_exit = True
-                self.issues.append({
+                yield {
                     "severity": "Warning",
                     "type": "pid_check_masking",
                     "line_number": idx + 1,
                     "code": line.strip(),
                     "description": f"Script exits early if PID exists — may block execution or mask stale PID issues (check near line {pid_line})"
-                })
+                }
                 found_pid_check = False  # Reset to avoid duplicate triggers
 
 
@@ -0,0 +1,155 @@
+# assistant/benchmark.py
+#
+# Load benchmark for the GPT-assisted paths (--analyze --gpt and --fix).
+# Runs every script in the test corpus through the agents at several concurrency
+# levels and reports throughput and p50/p99 latency. By default a local mock
+# server is started so the benchmark runs offline.
+#
+#   python3 benchmark.py --concurrency 1 4 16 --latency-ms 200 --jitter-ms 50
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.analyze_agent import AnalyzeAgent
+from agents.fix_agent import FixAgent
+from agents.script_parser import ScriptParser
+from utils.gpt import OpenAICompatibleBackend
+from utils.mock_server import MockLLMConfig, start_mock_server
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100.0 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def has_findings(script):
+    issues = ScriptParser().parse(script)
+    return isinstance(issues, list) and bool(issues)
+
+
+def run_analyze(backend, script):
+    result = AnalyzeAgent(backend=backend).analyze_script(script, use_gpt=True)
+    return "(No response from AI)" not in result
+
+
+def run_analyze_raw(backend, script):
+    result = AnalyzeAgent(backend=backend).analyze_script(script, use_gpt=True, compact=False)
+    return "(No response from AI)" not in result
+
+
+def run_fix(backend, script):
+    result = FixAgent(backend=backend).propose_fix(script)
+    return bool(result) and not result.startswith(("Error", "No response from AI"))
+
+
+# Analyze modes only reach the LLM when the parser finds something.
+GPT_ONLY_IF_FINDINGS = {"analyze", "analyze-raw"}
+
+MODES = {
+    "analyze": run_analyze,
+    "analyze-raw": run_analyze_raw,
+    "fix": run_fix,
+}
+
+
+def timed_call(func, backend, script):
+    start = time.perf_counter()
+    ok = func(backend, script)
+    return time.perf_counter() - start, ok
+
+
+def run_level(func, backend, scripts, concurrency, rounds):
+    jobs = scripts * rounds
+    latencies = []
+    failures = 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, ok in pool.map(lambda script: timed_call(func, backend, script), jobs):
+            latencies.append(elapsed)
+            if not ok:
+                failures += 1
+    wall = time.perf_counter() - start
+
+    return {
+        "requests": len(jobs),
+        "failures": failures,
+        "wall": wall,
+        "throughput": len(jobs) / wall if wall else 0.0,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GPT-assisted analyze/fix paths")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="Directory of scripts to run (default: test/)")
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=["analyze", "analyze-raw", "fix"],
+                        help="analyze-raw sends the uncompacted prompt, for comparison with analyze")
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--rounds', type=int, default=1, help="Times to repeat the corpus per level")
+    parser.add_argument('--base-url', help="Use an existing OpenAI-compatible endpoint instead of the bundled mock")
+    parser.add_argument('--model', default="mock")
+    parser.add_argument('--stream', action='store_true', help="Request streamed responses")
+    parser.add_argument('--latency-ms', type=float, default=100, help="Mock server base latency")
+    parser.add_argument('--ms-per-1k-tokens', type=float, default=50, help="Mock server delay per 1,000 prompt tokens")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Mock server latency jitter")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Mock server injected error rate")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    scripts = sorted(glob.glob(os.path.join(args.corpus, "*.sh")))
+    if not scripts:
+        print(f"No scripts found in {args.corpus}")
+        return
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        config = MockLLMConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               error_rate=args.error_rate, seed=args.seed,
+                               ms_per_1k_tokens=args.ms_per_1k_tokens)
+        server, base_url = start_mock_server(config)
+
+    # Scripts without findings never call the LLM; timing them would drag p50 down.
+    analyze_scripts = [script for script in scripts if has_findings(script)]
+    print(f"[INFO] Benchmarking {len(scripts)} scripts against {base_url}")
+    if GPT_ONLY_IF_FINDINGS & set(args.modes) and len(analyze_scripts) < len(scripts):
+        print(f"[INFO] Analyze modes skip {len(scripts) - len(analyze_scripts)} scripts with no findings (no GPT request made)")
+    header = f"{'mode':<11} {'conc':>4} {'reqs':>5} {'fail':>4} {'wall s':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+
+    try:
+        for mode in args.modes:
+            for concurrency in args.concurrency:
+                backend = OpenAICompatibleBackend(base_url=base_url, model=args.model,
+                                                  api_key=os.getenv("LLM_API_KEY"), stream=args.stream,
+                                                  pool_size=concurrency)
+                mode_scripts = analyze_scripts if mode in GPT_ONLY_IF_FINDINGS else scripts
+                # Agents print progress/errors; keep the results table readable.
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stats = run_level(MODES[mode], backend, mode_scripts, concurrency, args.rounds)
+                print(
+                    f"{mode:<11} {concurrency:>4} {stats['requests']:>5} {stats['failures']:>4} "
+                    f"{stats['wall']:>8.2f} {stats['throughput']:>8.2f} "
+                    f"{stats['p50'] * 1000:>8.1f} {stats['p99'] * 1000:>8.1f}"
+                )
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
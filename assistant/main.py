@@ -1,6 +1,7 @@
 # assistant/main.py
 
 import argparse
+import os
 import sys
 import shutil
 import subprocess
@@ -10,12 +11,27 @@ from agents.fix_agent import FixAgent
 from agents.execute_agent import ExecuteAgent
 from agents.stabilize_agent import StabilizeAgent
 from agents.simulate_agent import SimulateAgent
+from agents.cross_file import CrossFileAnalyzer
+from utils.compaction import DEFAULT_TOKEN_BUDGET
+from utils.severity import SEVERITY_ORDER
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 def main():
     parser = argparse.ArgumentParser(description="AI SysAdmin Assistant CLI")
 
     parser.add_argument('--analyze', metavar='SCRIPT', help="Analyze a script or log file")
     parser.add_argument('--gpt', action='store_true', help="(Optional) Use GPT for explanation with --analyze")
+    parser.add_argument('--token-budget', type=positive_int, metavar='N', help=f"Approximate token cap for the --gpt prompt (default: {DEFAULT_TOKEN_BUDGET})")
+    parser.add_argument('--min-severity', choices=SEVERITY_ORDER, metavar='LEVEL', help=f"Only report findings at or above LEVEL ({', '.join(SEVERITY_ORDER)})")
+    parser.add_argument('--max-findings', type=positive_int, metavar='N', help="Stop scanning a file after N findings (with a directory, the cap applies to each file separately)")
+    parser.add_argument('--fail-fast', action='store_true', help="Exit with status 1 on the first finding (combine with --min-severity Critical for CI gates; not combinable with --gpt, --token-budget or --max-findings)")
+    parser.add_argument('--cross-file', action='store_true', help="Follow source/. includes and report taint and cache flows across files (--analyze may be a directory)")
+    parser.add_argument('--include-path', action='append', default=[], metavar='DIR', help="Extra directory to search when resolving sourced files (repeatable)")
     parser.add_argument('--fix', metavar='SCRIPT', help="Propose a fix for a script")
     parser.add_argument('--execute', metavar='TASK', help="Execute a system task")
     parser.add_argument('--stabilize', action='store_true', help="Run stabilization checks")
@@ -23,6 +39,15 @@ def main():
 
     args = parser.parse_args()
 
+    if args.fail_fast:
+        conflicting = [flag for flag, value in (("--gpt", args.gpt),
+                                                ("--token-budget", args.token_budget is not None),
+                                                ("--max-findings", args.max_findings is not None)) if value]
+        if conflicting:
+            parser.error(f"--fail-fast cannot be combined with {', '.join(conflicting)}")
+    if args.token_budget is None:
+        args.token_budget = DEFAULT_TOKEN_BUDGET
+
     def print_or_page(text):
         try:
             with open("last_analysis_output.log", "w", encoding="utf-8") as f:
@@ -33,9 +58,31 @@ def main():
             print(text)
 
 
-    if args.analyze:
-        agent = AnalyzeAgent()
-        result = agent.analyze_script(args.analyze, use_gpt=args.gpt)
+    cross_file = CrossFileAnalyzer(include_paths=args.include_path) if args.cross_file else None
+
+    if args.analyze and args.fail_fast:
+        # CI gate: stream findings and stop at the first one; nothing is buffered.
+        agent = AnalyzeAgent(cross_file=cross_file)
+        for path in agent.script_paths(args.analyze):
+            try:
+                for issue in agent.iter_findings(path, min_severity=args.min_severity, max_findings=1):
+                    print(f"{path}:")
+                    print(f"- [{issue['type']}] Line {issue['line_number']}: {issue['description']}")
+                    print(f"    Code: {issue['code']}")
+                    sys.exit(1)
+            except (OSError, UnicodeDecodeError) as error:
+                print(f"Error reading file: {str(error)}")
+                sys.exit(2)
+        print("No findings at or above the requested severity.")
+
+    elif args.analyze:
+        agent = AnalyzeAgent(cross_file=cross_file)
+        options = dict(use_gpt=args.gpt, token_budget=args.token_budget,
+                       min_severity=args.min_severity, max_findings=args.max_findings)
+        if os.path.isdir(args.analyze):
+            result = agent.analyze_tree(args.analyze, **options)
+        else:
+            result = agent.analyze_script(args.analyze, **options)
 
         if isinstance(result, str):
             print_or_page(result)
@@ -0,0 +1,207 @@
+# assistant/utils/compaction.py
+
+import re
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+
+from utils.severity import severity_rank
+
+# Rough chars-per-token ratio for English/code mixes. Good enough for budgeting
+# without pulling in a tokenizer dependency.
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 3000
+NEAR_DUPLICATE_RATIO = 0.9
+# Fuzzy matching only compares against this many recent lines with the same
+# finding types, which keeps compaction linear in the number of findings.
+MAX_FUZZY_CANDIDATES = 16
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def normalize_code(code: str) -> str:
+    """
+    Reduce a line of code to a shape used for near-duplicate matching:
+    collapse whitespace and blank out quoted strings and numbers.
+    """
+    shape = re.sub(r'"[^"]*"', '""', code)
+    shape = re.sub(r"'[^']*'", "''", shape)
+    shape = re.sub(r'\d+', '0', shape)
+    return re.sub(r'\s+', ' ', shape).strip()
+
+
+def group_findings(issues):
+    """
+    Group parser findings by line number so each code line appears once,
+    with every detector's description attached to it.
+    Returns groups ordered by line number.
+    """
+    groups = {}
+    for issue in issues:
+        line_number = issue["line_number"]
+        group = groups.get(line_number)
+        if group is None:
+            group = {
+                "line_number": line_number,
+                "code": issue["code"],
+                "severity": issue.get("severity", "Info"),
+                "types": [],
+                "descriptions": [],
+            }
+            groups[line_number] = group
+
+        if severity_rank(issue.get("severity", "Info")) < severity_rank(group["severity"]):
+            group["severity"] = issue.get("severity", "Info")
+        if issue["type"] not in group["types"]:
+            group["types"].append(issue["type"])
+        if issue["description"] not in group["descriptions"]:
+            group["descriptions"].append(issue["description"])
+
+    return [groups[line_number] for line_number in sorted(groups)]
+
+
+def find_near_duplicate(shape, chars, candidates):
+    """
+    Return the most recent candidate whose shape is near-identical to shape.
+    Cheap upper bounds (length, shared character counts) are checked before
+    the full ratio, and at most MAX_FUZZY_CANDIDATES are compared.
+    """
+    matcher = None
+    for candidate in reversed(candidates[-MAX_FUZZY_CANDIDATES:]):
+        total = len(shape) + len(candidate["shape"])
+        if not total or 2 * min(len(shape), len(candidate["shape"])) < NEAR_DUPLICATE_RATIO * total:
+            continue
+        if 2 * sum((chars & candidate["chars"]).values()) < NEAR_DUPLICATE_RATIO * total:
+            continue
+        if matcher is None:
+            # seq2 is indexed once and reused; only seq1 changes per candidate.
+            matcher = SequenceMatcher(None, "", shape)
+        matcher.set_seq1(candidate["shape"])
+        if matcher.ratio() >= NEAR_DUPLICATE_RATIO:
+            return candidate
+    return None
+
+
+def collapse_similar_lines(groups):
+    """
+    Fold groups whose code is identical or near-identical (after normalization)
+    into an earlier occurrence with the same finding types, recording the extra
+    line numbers on it. Descriptions that differ are kept, tagged with their line.
+    """
+    representatives = []
+    exact_index = {}
+    buckets = {}  # finding types -> representatives with those types
+
+    for group in groups:
+        shape = normalize_code(group["code"])
+        types = tuple(group["types"])
+        key = (shape, types)
+        match = exact_index.get(key)
+
+        chars = Counter(shape)
+        if match is None:
+            match = find_near_duplicate(shape, chars, buckets.get(types, []))
+
+        if match is not None:
+            match["also_lines"].append(group["line_number"])
+            # Keep line-specific details (keywords, "after check at line N") the folded line adds.
+            for description in group["descriptions"]:
+                if description not in match["descriptions"]:
+                    match["descriptions"].append(f"(line {group['line_number']}) {description}")
+            if severity_rank(group["severity"]) < severity_rank(match["severity"]):
+                match["severity"] = group["severity"]
+            continue
+
+        entry = dict(group, descriptions=list(group["descriptions"]), shape=shape, chars=chars, also_lines=[])
+        representatives.append(entry)
+        exact_index[key] = entry
+        buckets.setdefault(types, []).append(entry)
+
+    return representatives
+
+
+def format_group(group):
+    header = f"Line {group['line_number']}"
+    if group["also_lines"]:
+        header += " (same pattern at lines " + ", ".join(str(n) for n in group["also_lines"]) + ")"
+    return (
+        f"{header}:\n"
+        f"{group['code']}\n"
+        f"Context: {'; '.join(group['descriptions'])}\n\n"
+    )
+
+
+def build_findings_prompt(header, issues):
+    """
+    The uncompacted prompt: one entry per finding, in parser order.
+    """
+    prompt = header
+    for issue in issues:
+        prompt += (
+            f"Line {issue['line_number']}:\n"
+            f"{issue['code']}\n"
+            f"Context: {issue['description']}\n\n"
+        )
+    return prompt
+
+
+def compact_findings_prompt(header, issues, token_budget=DEFAULT_TOKEN_BUDGET):
+    """
+    Build a prompt from parser findings that stays within token_budget.
+
+    Findings are grouped by line, near-identical lines are collapsed, and
+    groups are added most-severe first until the budget is reached. Anything
+    left over is summarized by finding type.
+
+    Returns (prompt, stats) where stats reports the estimated savings and the
+    time spent compacting.
+    """
+    start = time.perf_counter()
+    naive_prompt = build_findings_prompt(header, issues)
+
+    groups = collapse_similar_lines(group_findings(issues))
+    ranked = sorted(groups, key=lambda g: (severity_rank(g["severity"]), g["line_number"]))
+
+    used_tokens = estimate_tokens(header)
+    included = []
+    omitted = []
+    for group in ranked:
+        block = format_group(group)
+        block_tokens = estimate_tokens(block)
+        if included and used_tokens + block_tokens > token_budget:
+            omitted.append(group)
+            continue
+        included.append(group)
+        used_tokens += block_tokens
+
+    included.sort(key=lambda g: g["line_number"])
+    prompt = header + "".join(format_group(group) for group in included)
+
+    if omitted:
+        type_counts = Counter()
+        for group in omitted:
+            type_counts.update(group["types"])
+        summary = ", ".join(f"{name} x{count}" for name, count in type_counts.most_common())
+        omitted_lines = sum(1 + len(group["also_lines"]) for group in omitted)
+        prompt += (
+            f"(Omitted {omitted_lines} lower-priority lines to fit the prompt budget. "
+            f"Finding types: {summary})\n"
+        )
+
+    original_tokens = estimate_tokens(naive_prompt)
+    compacted_tokens = estimate_tokens(prompt)
+    stats = {
+        "findings": len(issues),
+        "groups": len(groups),
+        "included": len(included),
+        "omitted": len(omitted),
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "saved_tokens": max(original_tokens - compacted_tokens, 0),
+        "compaction_ms": (time.perf_counter() - start) * 1000,
+    }
+    return prompt, stats
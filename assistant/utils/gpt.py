@@ -1,6 +1,9 @@
 # assistant/utils/gpt.py
 
+import json
 import os
+from abc import ABC, abstractmethod
+
 import requests
 from dotenv import load_dotenv
 
@@ -8,32 +11,130 @@ load_dotenv()
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
-def ask_gpt(prompt: str) -> str:
-    if not OPENROUTER_API_KEY:
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODEL = "openai/gpt-4-turbo"
+
+
+class LLMBackend(ABC):
+    """
+    Interface every LLM backend implements. complete() returns the reply text
+    and raises on transport or response-format errors; ask_gpt() handles those.
+    """
+    name = "base"
+
+    @abstractmethod
+    def complete(self, prompt: str) -> str:
+        ...
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """
+    Talks to any OpenAI-compatible /chat/completions endpoint
+    (OpenRouter, a local mock server, vLLM, llama.cpp, ...).
+    """
+    name = "openai-compatible"
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, model=DEFAULT_MODEL, api_key=None,
+                 max_tokens=8192, timeout=20, stream=False, pool_size=None):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.stream = stream
+        self.session = requests.Session()
+        if pool_size:
+            # Size the pool for the number of threads sharing this backend.
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+    def complete(self, prompt: str) -> str:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        body = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ]
+        }
+        if self.stream:
+            body["stream"] = True
+
+        response = self.session.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=body,
+            timeout=self.timeout,
+            stream=self.stream,
+        )
+        response.raise_for_status()
+
+        if not self.stream:
+            data = response.json()
+            return data["choices"][0]["message"]["content"].strip()
+
+        # Server-sent events: "data: {...}" chunks terminated by "data: [DONE]".
+        # SSE is UTF-8 by spec; decode bytes ourselves since requests falls back
+        # to ISO-8859-1 when the Content-Type has no charset.
+        parts = []
+        for raw_bytes in response.iter_lines():
+            raw_line = raw_bytes.decode("utf-8")
+            if not raw_line or not raw_line.startswith("data:"):
+                continue
+            payload = raw_line[len("data:"):].strip()
+            if payload == "[DONE]":
+                break
+            chunk = json.loads(payload)
+            delta = chunk["choices"][0].get("delta", {})
+            parts.append(delta.get("content") or "")
+        return "".join(parts).strip()
+
+
+def backend_from_env() -> LLMBackend:
+    """
+    Build the default backend. LLM_BASE_URL / LLM_MODEL / LLM_API_KEY / LLM_STREAM
+    override the OpenRouter defaults, e.g. to point at utils/mock_server.py.
+    """
+    base_url = os.getenv("LLM_BASE_URL", DEFAULT_BASE_URL)
+    api_key = os.getenv("LLM_API_KEY") or (OPENROUTER_API_KEY if base_url == DEFAULT_BASE_URL else None)
+    return OpenAICompatibleBackend(
+        base_url=base_url,
+        model=os.getenv("LLM_MODEL", DEFAULT_MODEL),
+        api_key=api_key,
+        stream=os.getenv("LLM_STREAM", "").lower() in ("1", "true", "yes"),
+    )
+
+
+_backend = None
+
+
+def get_backend() -> LLMBackend:
+    global _backend
+    if _backend is None:
+        _backend = backend_from_env()
+    return _backend
+
+
+def set_backend(backend: LLMBackend):
+    global _backend
+    _backend = backend
+
+
+def ask_gpt(prompt: str, backend: LLMBackend = None) -> str:
+    backend = backend or get_backend()
+
+    if isinstance(backend, OpenAICompatibleBackend) and backend.base_url == DEFAULT_BASE_URL and not backend.api_key:
         print("ERROR: OpenRouter API key not found.")
         return ""
 
-    api_url = "https://openrouter.ai/api/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    body = {
-        "model": "openai/gpt-4-turbo",
-        "max_tokens": 8192,
-        "messages": [
-            {"role": "user", "content": prompt}
-        ]
-    }
-
     try:
-        response = requests.post(api_url, headers=headers, json=body, timeout=20)
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"].strip()
+        return backend.complete(prompt)
     except requests.exceptions.RequestException as api_error:
         print(f"API request failed: {api_error}")
         return ""
-    except (KeyError, IndexError) as parsing_error:
+    except (KeyError, IndexError, ValueError) as parsing_error:
         print(f"Unexpected API response format: {parsing_error}")
         return ""
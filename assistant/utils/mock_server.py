@@ -0,0 +1,176 @@
+# assistant/utils/mock_server.py
+#
+# Local OpenAI-compatible mock server for running the GPT-assisted paths offline.
+#
+#   python3 -m utils.mock_server --port 8088 --latency-ms 300 --jitter-ms 100 --error-rate 0.05
+#   LLM_BASE_URL=http://127.0.0.1:8088/v1 python3 main.py --analyze script.sh --gpt
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockLLMConfig:
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, error_status=500,
+                 chunk_delay_ms=0, reply=None, seed=None, ms_per_1k_tokens=0):
+        self.latency_ms = latency_ms
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunk_delay_ms = chunk_delay_ms
+        self.reply = reply
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests_served = 0
+        self.errors_injected = 0
+
+    def next_delay(self, prompt_tokens=0):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        # Prompt-size term models prefill cost, so smaller prompts answer faster.
+        size_ms = self.ms_per_1k_tokens * prompt_tokens / 1000.0
+        return max(self.latency_ms + size_ms + jitter, 0) / 1000.0
+
+    def should_fail(self):
+        with self.lock:
+            return self.error_rate > 0 and self.random.random() < self.error_rate
+
+
+def build_reply(config, prompt):
+    if config.reply is not None:
+        return config.reply
+    if "Respond ONLY with the improved script" in prompt:
+        return "```bash\n#!/bin/bash\nset -euo pipefail\n# mock fix — “hardened”\n```"
+    lines = [line for line in prompt.splitlines() if line.startswith("Line ")]
+    if lines:
+        return "\n".join(f"{line.split(':')[0]}: mock explanation — “risky” input." for line in lines)
+    return f"Mock summary — {len(prompt)}-character prompt."
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    config = MockLLMConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        # Raw UTF-8 (no \u escapes) so clients' decoding of non-ASCII text is exercised.
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            prompt = body["messages"][-1]["content"]
+        except (ValueError, KeyError, IndexError) as error:
+            self.send_json(400, {"error": {"message": f"Bad request: {error}"}})
+            return
+
+        config = self.config
+        time.sleep(config.next_delay(len(prompt) // 4))
+
+        with config.lock:
+            config.requests_served += 1
+        if config.should_fail():
+            with config.lock:
+                config.errors_injected += 1
+            self.send_json(config.error_status, {"error": {"message": "Injected mock failure"}})
+            return
+
+        reply = build_reply(config, prompt)
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "mock")
+
+        if not body.get("stream"):
+            self.send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(reply) // 4},
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")  # no charset, as many servers send it
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        for word in reply.split(" "):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if config.chunk_delay_ms:
+                time.sleep(config.chunk_delay_ms / 1000.0)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def start_mock_server(config=None, host="127.0.0.1", port=0, background=True):
+    """
+    Create the mock server and, if background is set, start serving on a
+    daemon thread. Returns (server, base_url); call server.shutdown() when
+    finished, or server.serve_forever() to serve in the foreground.
+    """
+    handler = type("ConfiguredMockLLMHandler", (MockLLMHandler,), {"config": config or MockLLMConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock LLM server")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8088)
+    parser.add_argument('--latency-ms', type=float, default=0, help="Base delay before each response")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Uniform +/- jitter added to the delay")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=500, help="HTTP status used for injected errors")
+    parser.add_argument('--ms-per-1k-tokens', type=float, default=0, help="Extra delay per 1,000 prompt tokens")
+    parser.add_argument('--chunk-delay-ms', type=float, default=0, help="Delay between streamed chunks")
+    parser.add_argument('--reply', help="Fixed reply text (default: generated from the prompt)")
+    parser.add_argument('--seed', type=int, help="Random seed for reproducible jitter/errors")
+    args = parser.parse_args()
+
+    config = MockLLMConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        chunk_delay_ms=args.chunk_delay_ms,
+        reply=args.reply,
+        seed=args.seed,
+        ms_per_1k_tokens=args.ms_per_1k_tokens,
+    )
+    server, base_url = start_mock_server(config, host=args.host, port=args.port, background=False)
+    print(f"[INFO] Mock LLM server listening on {base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# assistant/utils/severity.py
+
+# Most to least severe. Findings without a severity are ranked as "Info".
+SEVERITY_ORDER = ["Critical", "High", "Warning", "Medium", "Low", "Info"]
+
+
+def severity_rank(severity):
+    if severity in SEVERITY_ORDER:
+        return SEVERITY_ORDER.index(severity)
+    return len(SEVERITY_ORDER)
+
+
+def meets_severity(issue, min_severity):
+    """
+    True if the finding is at least as severe as min_severity (None allows everything).
+    """
+    if min_severity is None:
+        return True
+    return severity_rank(issue.get("severity", "Info")) <= severity_rank(min_severity)
@@ -0,0 +1,16 @@
+#!/bin/bash
+
+# Deploy script whose risky inputs all come from sourced libraries.
+
+source "$(dirname "$0")/lib/config.sh"
+source "$(dirname "$0")/lib/guard_a.sh"
+source "$(dirname "$0")/lib/ring1.sh"
+source "$(dirname "$0")/lib/legacy-latin1.sh"
+source "$PLUGIN_DIR/plugin.sh"
+
+build_id=$(get_cache build_id)
+store_cache last_run "$(date +%s)"
+
+eval "$CONFIG_CMD"
+eval "ssh $TARGET uptime"
+eval "$RING_INPUT"
@@ -0,0 +1,14 @@
+#!/bin/bash
+
+# Shared config library: pulls a command string from a config file and
+# exposes a small cache API used by the deploy scripts.
+
+CONFIG_CMD=$(grep '^post_deploy=' /etc/deploy.conf | cut -d= -f2)
+
+store_cache() {
+    echo "$2" > "/var/cache/deploy/$1"
+}
+
+get_cache() {
+    cat "/var/cache/deploy/$1"
+}
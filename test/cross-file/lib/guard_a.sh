@@ -0,0 +1,9 @@
+#!/bin/bash
+
+# Mutually sourced with guard_b.sh; the include guard stops the recursion at runtime.
+[ -n "$GUARD_A_LOADED" ] && return
+GUARD_A_LOADED=1
+
+source "${BASH_SOURCE%/*}/guard_b.sh"
+
+TARGET="$REMOTE_HOST"
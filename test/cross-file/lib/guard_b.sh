@@ -0,0 +1,9 @@
+#!/bin/bash
+
+# Mutually sourced with guard_a.sh.
+[ -n "$GUARD_B_LOADED" ] && return
+GUARD_B_LOADED=1
+
+source "${BASH_SOURCE%/*}/guard_a.sh"
+
+REMOTE_HOST=$(cat /etc/remote_host)
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Legacy library saved as Latin-1 (not valid UTF-8): t
+LEGACY_MODE=1
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# ring1 -> ring2 -> ring3 -> ring1 include cycle.
+source "${BASH_SOURCE%/*}/ring2.sh"
@@ -0,0 +1,3 @@
+#!/bin/bash
+
+source "${BASH_SOURCE%/*}/ring3.sh"
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+source "${BASH_SOURCE%/*}/ring1.sh"
+RING_INPUT=$(awk '{print $1}' /tmp/ring_input)